@@ -8,11 +8,16 @@ specified solver algorithm on the Gridworld.
 Example Usage:
 python main.py -a value_iteration
 python main.py --algorithm policy_iteration
+python main.py -a policy_iteration -k 10
+python main.py -a value_iteration_numba
+python main.py -a gauss_seidel_value_iteration
 """
 
 import argparse
 from src.gridworld import Gridworld
-from src.solver import value_iteration, policy_iteration
+from src.solver import (
+    value_iteration, gauss_seidel_value_iteration, policy_iteration
+)
 
 def print_policy(policy, gridworld):
     """Prints the policy grid to the console."""
@@ -69,11 +74,27 @@ def main():
         '-a', '--algorithm', 
         type=str, 
         default='value_iteration', 
-        choices=['value_iteration', 'policy_iteration'],
+        choices=[
+            'value_iteration', 'gauss_seidel_value_iteration',
+            'policy_iteration', 'value_iteration_numba'
+        ],
         help="The solver algorithm to use (default: value_iteration)"
     )
     
+    parser.add_argument(
+        '-k', '--k-eval',
+        type=int,
+        default=None,
+        help="Evaluation sweeps per step (at least 1); only valid with "
+             "policy_iteration, which then runs Modified Policy Iteration"
+    )
+    
     args = parser.parse_args()
+    if args.k_eval is not None:
+        if args.algorithm != 'policy_iteration':
+            parser.error("-k/--k-eval is only supported by policy_iteration")
+        if args.k_eval < 1:
+            parser.error("-k/--k-eval must be at least 1")
     
     # Initialize the environment
     gridworld = Gridworld()
@@ -82,8 +103,14 @@ def main():
     
     if args.algorithm == 'value_iteration':
         policy, utilities = value_iteration(gridworld)
+    elif args.algorithm == 'gauss_seidel_value_iteration':
+        policy, utilities = gauss_seidel_value_iteration(gridworld)
+    elif args.algorithm == 'policy_iteration':
+        policy, utilities = policy_iteration(gridworld, k_eval=args.k_eval)
     else:
-        policy, utilities = policy_iteration(gridworld)
+        # Imported here so numba stays an optional dependency
+        from src.solver_numba import value_iteration_numba
+        policy, utilities = value_iteration_numba(gridworld)
         
     print("-" * 30)
     print_utilities(utilities, gridworld)
@@ -24,6 +24,17 @@ Grid Layout (row, col):
 """
 import collections
 
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Action names, indexed by action id
+ACTIONS = ('North', 'South', 'East', 'West')
+
+# Tables indexed by action id (see ACTIONS)
+_MOVES = ((-1, 0), (1, 0), (0, 1), (0, -1))
+_SLIP_L = (3, 2, 0, 1)  # 90 degrees left of each action
+_SLIP_R = (2, 3, 1, 0)  # 90 degrees right of each action
+
 class Gridworld:
     def __init__(self):
         # Grid dimensions
@@ -37,6 +48,9 @@ class Gridworld:
         self.trap_state = (1, 3)
         self.terminal_states = {self.goal_state, self.trap_state}
         
+        # The walls as a bitmask over the cells (bit r * width + c)
+        self.wall_bits = sum(1 << (r * self.width + c) for r, c in self.wall_states)
+        
         # Rewards
         self.living_penalty = -0.04
         self.rewards = {
@@ -45,24 +59,64 @@ class Gridworld:
         }
         
         # Actions and transitions
-        self.actions = ['North', 'South', 'East', 'West']
+        self.actions = list(ACTIONS)
         self.slip_prob = 0.1
         self.move_prob = 0.8
         
+        # Boundary/wall checks specialized to this grid's shape and walls
+        self._check_move = self._compile_check_move()
+        
         # Build the list of all valid (non-wall) states
         self.states = set()
         for r in range(self.height):
             for c in range(self.width):
-                if (r, c) not in self.wall_states:
+                if not self._is_wall(r, c):
                     self.states.add((r, c))
 
+        # Integer indexing so solvers can keep utilities in flat arrays.
+        # States closest to the goal/trap come first: in-place sweeps then
+        # propagate the terminal rewards outward within a single sweep.
+        distance = self._distances_from_terminals()
+        self.idx_to_state = sorted(self.states, key=lambda state: (distance[state], state))
+        self.state_to_idx = {state: i for i, state in enumerate(self.idx_to_state)}
+        self.terminal_mask = np.array(
+            [state in self.terminal_states for state in self.idx_to_state]
+        )
+
+        # next_idx[a, i] is the index of the state reached from state i
+        # when move a succeeds (or i itself if it is blocked)
+        self.next_idx = np.empty((len(_MOVES), len(self.idx_to_state)), dtype=np.int32)
+        for a, move in enumerate(_MOVES):
+            for i, state in enumerate(self.idx_to_state):
+                self.next_idx[a, i] = self.state_to_idx[self._check_move(state, move)]
+
+        # Transitions never change, so build them once up front
+        self._precompute_transitions()
+
+    def _distances_from_terminals(self):
+        """
+        Breadth-first search outward from the terminal states.
+        Returns a dictionary {state: number of moves to the nearest terminal};
+        walls block movement, and unreachable states get infinity.
+        """
+        distance = {state: 0 for state in self.terminal_states}
+        frontier = collections.deque(self.terminal_states)
+        while frontier:
+            state = frontier.popleft()
+            for move in _MOVES:
+                neighbor = self._check_move(state, move)
+                if neighbor not in distance:
+                    distance[neighbor] = distance[state] + 1
+                    frontier.append(neighbor)
+        return {state: distance.get(state, float('inf')) for state in self.states}
+
     def getStates(self):
         """Returns all valid states in the grid."""
         return self.states
 
     def getActions(self, state):
         """Returns valid actions for a given state."""
-        if state in self.terminal_states:
+        if self.isTerminal(state):
             return []  # No actions can be taken from a terminal state
         return self.actions
 
@@ -74,55 +128,63 @@ class Gridworld:
         """Checks if a state is terminal."""
         return state in self.terminal_states
 
-    def _check_move(self, state, move):
+    def _is_wall(self, r, c):
+        """Checks the wall bitmask for cell (r, c); off-grid cells give 0."""
+        if not (0 <= r < self.height and 0 <= c < self.width):
+            return 0
+        return (self.wall_bits >> (r * self.width + c)) & 1
+
+    def _compile_check_move(self):
         """
-        Helper function to check if a move is valid.
+        Generates _check_move(state, move) specialized to this grid.
+        The grid size and wall cells are baked into the source as literals,
+        so each call is a handful of constant comparisons.
         If the move is invalid (off-grid or into a wall),
-        it returns the *original* state.
+        the generated function returns the *original* state.
         """
-        next_r, next_c = state[0] + move[0], state[1] + move[1]
-        next_state = (next_r, next_c)
-        
-        # Check for boundary or wall collision
-        if (not (0 <= next_r < self.height) or
-            not (0 <= next_c < self.width) or
-            next_state in self.wall_states):
-            return state  # Stay in the original state
-        return next_state # Valid move
+        blocked = ["r < 0", f"r >= {self.height}", "c < 0", f"c >= {self.width}"]
+        blocked += [f"(r == {r} and c == {c})" for r, c in sorted(self.wall_states)]
+        source = (
+            "def _check_move(state, move):\n"
+            "    r = state[0] + move[0]\n"
+            "    c = state[1] + move[1]\n"
+            f"    if {' or '.join(blocked)}:\n"
+            "        return state\n"
+            "    return (r, c)\n"
+        )
+        namespace = {}
+        exec(source, namespace)
+        return namespace['_check_move']
+
+    def _precompute_transitions(self):
+        """
+        Caches the outcome of every (state, action) pair in
+        self._transitions as a tuple of (probability, next_state) tuples.
+        """
+        self._transitions = {}
+        for state in self.states:
+            for a, action in enumerate(self.actions):
+                self._transitions[(state, action)] = self._compute_transitions(state, a)
 
     def getTransitions(self, state, action):
         """
         Get the transition probabilities and next states for a given state-action.
-        Returns a list of (probability, next_state) tuples.
+        Returns a tuple of (probability, next_state) tuples.
+        """
+        return self._transitions.get((state, action), ())
+
+    def _compute_transitions(self, state, action_id):
+        """
+        Works out the transitions for a state and action id from the slip model.
+        Returns a tuple of (probability, next_state) tuples.
         """
         if self.isTerminal(state):
-            return []
-
-        # Define the intended move and the "slip" moves
-        moves = {
-            'North': (-1, 0),
-            'South': (1, 0),
-            'East': (0, 1),
-            'West': (0, -1)
-        }
-        
-        slip_left = {
-            'North': 'West',
-            'South': 'East',
-            'East': 'North',
-            'West': 'South'
-        }
-        
-        slip_right = {
-            'North': 'East',
-            'South': 'West',
-            'East': 'South',
-            'West': 'North'
-        }
-        
-        intended_move = moves[action]
-        left_move = moves[slip_left[action]]
-        right_move = moves[slip_right[action]]
+            return ()
+
+        # The intended move and the "slip" moves
+        intended_move = _MOVES[action_id]
+        left_move = _MOVES[_SLIP_L[action_id]]
+        right_move = _MOVES[_SLIP_R[action_id]]
         
         # Calculate the resulting states for each possible outcome
         # Use a defaultdict to aggregate probabilities for the same next_state
@@ -141,4 +203,36 @@ class Gridworld:
         next_state_right = self._check_move(state, right_move)
         transitions[next_state_right] += self.slip_prob
         
-        return list(transitions.items())
+        return tuple((prob, next_state) for next_state, prob in transitions.items())
+
+    def build_tensors(self):
+        """
+        Flattens the MDP into NumPy/SciPy arrays for vectorized solvers.
+        Returns a tuple (state_index, R, P) where:
+            state_index (list): The states in a fixed order; position i is state i
+            R (np.ndarray): Rewards as float32, shape (|S|,)
+            P (list): One sparse float32 |S| x |S| matrix per action, P[a][s, s'] = T(s, a, s')
+        """
+        state_index = self.idx_to_state
+        n = len(state_index)
+        active = np.flatnonzero(~self.terminal_mask)
+
+        # float32 is ample for a 1e-4 tolerance and halves memory traffic
+        R = np.array([self.getRewards(state) for state in state_index], dtype=np.float32)
+        P = []
+        for a in range(len(self.actions)):
+            # Intended move plus both slips for every non-terminal state;
+            # duplicate (row, col) entries are summed by the CSR conversion
+            rows = np.tile(active, 3)
+            cols = np.concatenate([
+                self.next_idx[a, active],
+                self.next_idx[_SLIP_L[a], active],
+                self.next_idx[_SLIP_R[a], active],
+            ])
+            data = np.repeat(
+                np.array([self.move_prob, self.slip_prob, self.slip_prob], dtype=np.float32),
+                len(active)
+            )
+            P.append(csr_matrix((data, (rows, cols)), shape=(n, n)))
+
+        return state_index, R, P
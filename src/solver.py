@@ -2,143 +2,204 @@
 solver.py
 
 This file implements the two core algorithms for solving MDPs:
-- Value Iteration
+- Value Iteration (batched, plus an in-place Gauss-Seidel variant)
 - Policy Iteration
 """
 import random
 
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve
+
+from .gridworld import ACTIONS
+
+def policy_from_indices(states, policy_idx, terminal):
+    """
+    Converts an array of action indices into a policy dictionary.
+    Action names are looked up as one array operation, and terminal
+    states are then set to None through the boolean mask.
+    
+    Returns:
+        policy (dict): A dictionary {state: action}
+    """
+    actions = np.array(ACTIONS, dtype=object)[policy_idx]
+    actions[terminal] = None
+    return dict(zip(states, actions.tolist()))
+
 def value_iteration(gridworld, discount=0.9, max_iterations=100, epsilon=1e-4):
     """
     Performs Value Iteration to find the optimal utility function and policy.
+    Each sweep is a single batched Bellman backup over the precomputed
+    reward vector R and the sparse per-action transition matrices P.
+    
+    Returns:
+        policy (dict): A dictionary {state: action}
+        U (dict): A dictionary {state: utility}
+    """
+    states, R, P = gridworld.build_tensors()
+    terminal = gridworld.terminal_mask
+    U = np.zeros(len(states), dtype=np.float32)
+
+    # Stopping on this residual makes the greedy policy epsilon-optimal
+    tol = epsilon * (1 - discount) / (2 * discount)
+
+    # Q for the initial U = 0, in case the loop never runs
+    last_Q = np.tile(R, (len(P), 1))
+
+    for _ in range(max_iterations):
+        # Q[a, s] = R(s) + discount * sum_s' T(s, a, s') U(s')
+        Q = np.vstack([R + discount * (P_a @ U) for P_a in P])
+
+        # Bellman update (terminal states keep their reward)
+        U_new = Q.max(axis=0)
+        U_new[terminal] = R[terminal]
+
+        # Check for convergence
+        delta = np.max(np.abs(U_new - U))
+        U = U_new
+        last_Q = Q
+        if delta < tol:
+            break
+            
+    # After convergence, the final sweep's Q already gives the optimal policy
+    policy_idx = last_Q.argmax(axis=0)
+    policy = policy_from_indices(states, policy_idx, terminal)
+    return policy, {state: float(U[i]) for i, state in enumerate(states)}
+
+def gauss_seidel_value_iteration(gridworld, discount=0.9, max_iterations=100, epsilon=1e-4):
+    """
+    Performs Value Iteration with in-place (Gauss-Seidel) updates.
+    Each state's new utility is written straight into U, so states later
+    in the same sweep already see it. This needs no copy of U per sweep
+    and usually converges in fewer sweeps than the batched version.
     
     Returns:
         policy (dict): A dictionary {state: action}
         U (dict): A dictionary {state: utility}
     """
-    states = gridworld.getStates()
-    U = {state: 0.0 for state in states}
+    states = gridworld.idx_to_state
+    state_to_idx = gridworld.state_to_idx
+
+    # Look rewards, actions, terminal flags and transitions up once, not
+    # every sweep. Transitions become (probability, next_index) pairs, so
+    # U is read by position with no state-tuple hashing. U is a plain list
+    # because this loop reads one element at a time.
+    U = [0.0] * len(states)
+    R = [float(gridworld.getRewards(state)) for state in states]
+    actions_per_state = [gridworld.getActions(state) for state in states]
+    terminal = gridworld.terminal_mask.tolist()
+    transitions_per_state = [
+        [
+            (action, tuple(
+                (prob, state_to_idx[next_state])
+                for prob, next_state in gridworld.getTransitions(state, action)
+            ))
+            for action in actions_per_state[i]
+        ]
+        for i, state in enumerate(states)
+    ]
+
+    # Greedy actions are recorded during each sweep; terminals never act.
+    # Start from the greedy policy for U = 0 (all actions tie, so the first
+    # wins), in case the loop never runs.
+    policy = {
+        state: None if terminal[i] else actions_per_state[i][0]
+        for i, state in enumerate(states)
+    }
+
+    # Stopping on this residual makes the greedy policy epsilon-optimal
+    tol = epsilon * (1 - discount) / (2 * discount)
 
     for _ in range(max_iterations):
-        U_new = U.copy()
         delta = 0
         
-        for state in states:
-            if gridworld.isTerminal(state):
-                U_new[state] = gridworld.getRewards(state)
-                continue
-            
-            # Calculate Q-value for each action
-            action_values = []
-            for action in gridworld.getActions(state):
-                q_value = 0
-                for prob, next_state in gridworld.getTransitions(state, action):
-                    q_value += prob * U[next_state]
-                action_values.append(q_value)
-            
-            # Bellman update
-            best_q = max(action_values) if action_values else 0
-            U_new[state] = gridworld.getRewards(state) + discount * best_q
+        for i, state in enumerate(states):
+            old = U[i]
+            if terminal[i]:
+                U[i] = R[i]
+            else:
+                best_action = None
+                best_q = -float('inf')
+                for action, transitions in transitions_per_state[i]:
+                    q_value = 0
+                    for prob, j in transitions:
+                        q_value += prob * U[j]
+                    if q_value > best_q:
+                        best_q = q_value
+                        best_action = action
+
+                # Bellman update, visible to the rest of this sweep
+                U[i] = R[i] + discount * best_q
+                policy[state] = best_action
             
-            # Check for convergence
-            delta = max(delta, abs(U_new[state] - U[state]))
+            delta = max(delta, abs(U[i] - old))
             
-        U = U_new
-        if delta < epsilon * (1 - discount) / discount:
+        if delta < tol:
             break
             
-    # After convergence, extract the optimal policy
-    policy = {}
-    for state in states:
-        if gridworld.isTerminal(state):
-            policy[state] = None
-            continue
-            
-        best_action = None
-        best_q = -float('inf')
-        
-        for action in gridworld.getActions(state):
-            q_value = 0
-            for prob, next_state in gridworld.getTransitions(state, action):
-                q_value += prob * U[next_state]
-                
-            if q_value > best_q:
-                best_q = q_value
-                best_action = action
-        policy[state] = best_action
-        
-    return policy, U
+    # The final sweep's greedy actions are the optimal policy
+    return policy, dict(zip(states, U))
 
-def policy_iteration(gridworld, discount=0.9, max_iterations=100, epsilon=1e-4):
+def policy_iteration(gridworld, discount=0.9, max_iterations=100, epsilon=1e-4, k_eval=None):
     """
     Performs Policy Iteration to find the optimal policy.
+    By default, policy evaluation solves the sparse linear system
+    (I - discount * P_pi) U = R exactly instead of iterating it to convergence.
+    
+    If k_eval is given, runs Modified Policy Iteration instead: each
+    evaluation is only k_eval Bellman backups under the current policy,
+    starting from the previous utilities, and the algorithm stops once the
+    policy is stable and the last backup changed U by less than the
+    epsilon-optimality bound.
     
     Returns:
         policy (dict): A dictionary {state: action}
         U (dict): A dictionary {state: utility}
     """
-    states = gridworld.getStates()
+    if k_eval is not None and k_eval < 1:
+        raise ValueError(f"k_eval must be at least 1, got {k_eval}")
     
-    # 1. Initialize a random policy
-    policy = {}
-    for state in states:
-        if gridworld.isTerminal(state):
-            policy[state] = None
-        else:
-            policy[state] = random.choice(gridworld.getActions(state))
+    states, R, P = gridworld.build_tensors()
+    terminal = gridworld.terminal_mask
+    n = len(states)
+    tol = epsilon * (1 - discount) / (2 * discount)
+    
+    # 1. Initialize a random policy (as action indices)
+    policy_idx = np.array(
+        [random.randrange(len(gridworld.actions)) for _ in states]
+    )
             
-    U = {state: 0.0 for state in states}
+    U = np.zeros(n, dtype=np.float32)
     
     for _ in range(max_iterations):
-        policy_stable = True
-        
         # 2. Policy Evaluation: Calculate utilities for the current policy
-        # We run a simplified version of value iteration
-        for _ in range(max_iterations):
-            U_new = U.copy()
+        # Row s of P_pi is T(s, pi(s), .); terminal rows are zeroed so that
+        # their utility is just their reward.
+        P_pi = sum(
+            sp.diags(((policy_idx == a) & ~terminal).astype(np.float32)) @ P_a
+            for a, P_a in enumerate(P)
+        )
+        if k_eval is None:
+            I = sp.identity(n, dtype=np.float32, format='csc')
+            U = spsolve(I - discount * P_pi, R)
             delta = 0
-            for state in states:
-                if gridworld.isTerminal(state):
-                    U_new[state] = gridworld.getRewards(state)
-                    continue
-
-                action = policy[state]
-                q_value = 0
-                for prob, next_state in gridworld.getTransitions(state, action):
-                    q_value += prob * U[next_state]
-                
-                U_new[state] = gridworld.getRewards(state) + discount * q_value
-                delta = max(delta, abs(U_new[state] - U[state]))
-                
-            U = U_new
-            if delta < epsilon * (1 - discount) / discount:
-                break
+        else:
+            # Modified Policy Iteration: a few backups, warm-started from U
+            for _ in range(k_eval):
+                U_new = R + discount * (P_pi @ U)
+                delta = np.max(np.abs(U_new - U))
+                U = U_new
         
         # 3. Policy Improvement: Find a new, better policy
-        for state in states:
-            if gridworld.isTerminal(state):
-                continue
-                
-            old_action = policy[state]
-            
-            best_action = None
-            best_q = -float('inf')
-            
-            for action in gridworld.getActions(state):
-                q_value = 0
-                for prob, next_state in gridworld.getTransitions(state, action):
-                    q_value += prob * U[next_state]
-                
-                if q_value > best_q:
-                    best_q = q_value
-                    best_action = action
-            
-            policy[state] = best_action
-            
-            if old_action != best_action:
-                policy_stable = False
+        new_policy_idx = np.vstack([P_a @ U for P_a in P]).argmax(axis=0)
+        policy_stable = np.array_equal(
+            new_policy_idx[~terminal], policy_idx[~terminal]
+        )
+        policy_idx = new_policy_idx
                 
-        # If the policy did not change, we have converged
-        if policy_stable:
+        # If the policy did not change (and U has settled), we have converged
+        if policy_stable and delta < tol:
             break
             
-    return policy, U
+    policy = policy_from_indices(states, policy_idx, terminal)
+    return policy, {state: float(U[i]) for i, state in enumerate(states)}
@@ -0,0 +1,96 @@
+"""
+solver_numba.py
+
+This file implements Value Iteration as a Numba-compiled kernel.
+It solves the same MDP as solver.value_iteration, but the Bellman
+backup runs as machine code, in parallel across states, over a
+CSR copy of the sparse transition matrices. This pays off on grids
+much larger than 4x3.
+
+Requires the optional `numba` package.
+"""
+import numpy as np
+import scipy.sparse as sp
+from numba import njit, prange
+
+from .solver import policy_from_indices
+
+def to_csr(P):
+    """
+    Stacks the per-action sparse matrices P[a] into one set of CSR arrays.
+    Row a * |S| + s of the result holds the transitions T(s, a, .).
+
+    Returns:
+        indptr (np.ndarray): Row start offsets, shape (|A| * |S| + 1,)
+        indices (np.ndarray): Column (next state) of each entry
+        data (np.ndarray): Probability of each entry
+    """
+    stacked = sp.vstack(P, format='csr')
+    return (
+        stacked.indptr.astype(np.int64),
+        stacked.indices.astype(np.int64),
+        stacked.data,
+    )
+
+@njit(cache=True, parallel=True)
+def vi_kernel(indptr, indices, data, R, discount, n_actions, max_iter, tol):
+    """
+    Runs Value Iteration over CSR transitions (see to_csr).
+    The greedy action of each state is recorded during every sweep,
+    so no separate policy-extraction pass is needed.
+    States are backed up in parallel: each sweep reads only U and writes
+    only U_new, so threads never race on the same array.
+    States without outgoing transitions (terminals) keep U(s) = R(s).
+
+    Returns:
+        U (np.ndarray): Utilities, shape (|S|,)
+        policy_idx (np.ndarray): Best action index per state, shape (|S|,)
+    """
+    n = R.shape[0]
+    U = np.zeros(n, dtype=R.dtype)
+    U_new = np.zeros(n, dtype=R.dtype)
+    policy_idx = np.zeros(n, dtype=np.int64)
+
+    for _ in range(max_iter):
+        for s in prange(n):
+            best_q = -np.inf
+            for a in range(n_actions):
+                row = a * n + s
+                q_value = 0.0
+                for k in range(indptr[row], indptr[row + 1]):
+                    q_value += data[k] * U[indices[k]]
+                if q_value > best_q:
+                    best_q = q_value
+                    policy_idx[s] = a
+            U_new[s] = R[s] + discount * best_q
+
+        delta = np.max(np.abs(U_new - U))
+        U, U_new = U_new, U
+        if delta < tol:
+            break
+
+    # The final sweep's greedy actions are the optimal policy
+    return U, policy_idx
+
+def value_iteration_numba(gridworld, discount=0.9, max_iterations=100, epsilon=1e-4):
+    """
+    Performs Value Iteration using the compiled kernel.
+
+    Returns:
+        policy (dict): A dictionary {state: action}
+        U (dict): A dictionary {state: utility}
+    """
+    states, R, P = gridworld.build_tensors()
+    terminal = gridworld.terminal_mask
+    indptr, indices, data = to_csr(P)
+
+    # Stopping on this residual makes the greedy policy epsilon-optimal
+    tol = epsilon * (1 - discount) / (2 * discount)
+
+    U, policy_idx = vi_kernel(
+        indptr, indices, data, R, discount, len(gridworld.actions),
+        max_iterations, tol
+    )
+
+    policy = policy_from_indices(states, policy_idx, terminal)
+    return policy, {state: float(U[i]) for i, state in enumerate(states)}